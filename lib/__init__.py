@@ -3,6 +3,13 @@ from .volume import VolumePanel
 from .orderbook import OrderBookPanel
 from .last_trade import LastTradePanel
 from .chart import CryptoChart
+from .heatmap import DepthHeatmapPanel
+from .alerts import AlertEngine, AlertRule
+from .alert_panel import AlertPanel
+from .capture import MarketCapture
+from .stream import StreamHub
+from .scheduler import RedrawScheduler
+from .tile import SymbolTile
 from .debug import log
 
 __all__ = [
@@ -11,5 +18,13 @@ __all__ = [
     'OrderBookPanel',
     'LastTradePanel',
     'CryptoChart',
+    'DepthHeatmapPanel',
+    'AlertEngine',
+    'AlertRule',
+    'AlertPanel',
+    'MarketCapture',
+    'StreamHub',
+    'RedrawScheduler',
+    'SymbolTile',
     'log'
 ]
@@ -0,0 +1,119 @@
+import tkinter as tk
+from .debug import log
+from .base_panel import BasePanel
+from .alerts import AlertRule
+
+DARK_BG = "#242a24"
+LIGHT_BG = "#2e352e"
+WHITE = "#ffffff"
+GRAY = "#9c9c9c"
+YELLOW = "#ffc800"
+FONT = ("Courier New", 11, "bold")
+FONT_SMALL = ("Courier New", 10, "bold")
+MAX_LOG_LINES = 50
+TOAST_MS = 4000
+TOAST_LINES = 3  # rules listed in a batched toast before it is summarized
+
+
+class AlertPanel(BasePanel):
+    """Alert log with a one-line rule editor; a symbol chooser picks which symbol new rules apply to."""
+
+    def __init__(self, parent, engine, symbols, on_rules_changed=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.on_rules_changed = on_rules_changed
+        self.toast = None
+
+        self.frame.config(bg=DARK_BG, padx=10, pady=5)
+
+        controls = tk.Frame(self.frame, bg=DARK_BG)
+        controls.pack(side=tk.LEFT, fill=tk.Y)
+
+        header = tk.Frame(controls, bg=DARK_BG)
+        header.pack(fill=tk.X)
+        tk.Label(header, text="Alerts", font=FONT, bg=DARK_BG, fg=YELLOW).pack(side=tk.LEFT)
+        self.count_label = tk.Label(header, font=FONT_SMALL, bg=DARK_BG, fg=GRAY)
+        self.count_label.pack(side=tk.RIGHT)
+
+        editor = tk.Frame(controls, bg=DARK_BG)
+        editor.pack(fill=tk.X, pady=4)
+        self.symbol_var = tk.StringVar(value=symbols[0].upper())
+        chooser = tk.OptionMenu(editor, self.symbol_var, *(s.upper() for s in symbols),
+                                command=lambda _: self.refresh_count())
+        chooser.config(font=FONT_SMALL, bg=YELLOW, fg="black", relief="flat", highlightthickness=0, width=9)
+        chooser.pack(side=tk.LEFT, padx=(0, 4))
+        self.entry = tk.Entry(editor, font=FONT_SMALL, bg=LIGHT_BG, fg=WHITE, insertbackground=WHITE, relief="flat",
+                              width=24)
+        self.entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.entry.insert(0, "cross 65000")
+        self.entry.bind("<Return>", lambda e: self.add_rule())
+        tk.Button(editor, text="Add", font=FONT_SMALL, bg=YELLOW, fg="black", relief="flat",
+                  command=self.add_rule).pack(side=tk.LEFT, padx=4)
+        tk.Button(editor, text="Clear", font=FONT_SMALL, bg=YELLOW, fg="black", relief="flat",
+                  command=self.clear_rules).pack(side=tk.LEFT)
+
+        self.log_list = tk.Listbox(self.frame, font=FONT_SMALL, bg=LIGHT_BG, fg=WHITE, height=3,
+                                   relief="flat", highlightthickness=0)
+        self.log_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(10, 0))
+
+        self.refresh_count()
+
+    @property
+    def symbol(self):
+        return self.symbol_var.get().lower()
+
+    def set_symbol(self, symbol):
+        self.symbol_var.set(symbol.upper())
+        self.refresh_count()
+
+    def refresh_count(self):
+        self.count_label.config(text=f"{len(self.engine.rules_for(self.symbol))} rules")
+
+    def add_rule(self):
+        try:
+            rule = self.engine.add_rule(AlertRule.parse(self.symbol, self.entry.get()))
+            log("ALERT", f"Added rule: {rule.describe()}")
+        except ValueError as e:
+            log("ALERT", f"Invalid rule: {e}")
+            return
+        self.refresh_count()
+        if self.on_rules_changed:
+            self.on_rules_changed()
+
+    def clear_rules(self):
+        for rule in self.engine.rules_for(self.symbol):
+            self.engine.remove_rule(rule)
+        self.refresh_count()
+        if self.on_rules_changed:
+            self.on_rules_changed()
+
+    def show_alerts(self, messages):
+        """Append a batch of fired alerts to the log and pop one desktop toast for it; call from the Tk thread."""
+        if not self.running or not self.frame.winfo_exists():
+            return
+        for message in messages:
+            self.log_list.insert(0, message)
+        if self.log_list.size() > MAX_LOG_LINES:
+            self.log_list.delete(MAX_LOG_LINES, tk.END)
+
+        if len(messages) == 1:
+            text = messages[0]
+        else:
+            text = "\n".join([f"{len(messages)} alerts"] + messages[:TOAST_LINES])
+            if len(messages) > TOAST_LINES:
+                text += f"\n... and {len(messages) - TOAST_LINES} more"
+
+        root = self.frame.winfo_toplevel()
+        root.bell()
+        # A newer batch replaces the toast still on screen rather than stacking on top of it
+        if self.toast is not None and self.toast.winfo_exists():
+            self.toast.destroy()
+        toast = self.toast = tk.Toplevel(root, bg=YELLOW, padx=12, pady=8)
+        toast.overrideredirect(True)
+        toast.attributes("-topmost", True)
+        tk.Label(toast, text=text, font=FONT, bg=YELLOW, fg="black", justify=tk.LEFT).pack()
+        toast.update_idletasks()
+        x = toast.winfo_screenwidth() - toast.winfo_reqwidth() - 20
+        y = toast.winfo_screenheight() - toast.winfo_reqheight() - 60
+        toast.geometry(f"+{x}+{y}")
+        toast.after(TOAST_MS, toast.destroy)
@@ -0,0 +1,298 @@
+import bisect
+import itertools
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from .debug import log
+from .volume import RollingVolume
+
+ALERT_LOG_FILE = "alerts.log"
+COOLDOWN = 30  # seconds before the same rule can fire again
+VOLUME_BASELINE = 3600  # seconds of traded volume the spike ratio is measured against
+VOLUME_WARMUP = 5  # windows of data needed before a volume rule is evaluated
+
+# cross  - price level, fires when the trade price crosses it in either direction
+# change - absolute percent move of the ticker price over `window` seconds
+# volume - volume traded in `window` seconds as a multiple of the baseline rate for that window
+# spread - best bid/ask spread in basis points
+RULE_KINDS = ("cross", "change", "volume", "spread")
+WINDOWED_KINDS = ("change", "volume")
+
+_rule_ids = itertools.count(1)
+
+
+class AlertRule:
+    def __init__(self, symbol, kind, threshold, window=0):
+        if kind not in RULE_KINDS:
+            raise ValueError(f"Unknown alert kind '{kind}'")
+        self.id = next(_rule_ids)
+        self.symbol = symbol.lower()
+        self.kind = kind
+        self.threshold = float(threshold)
+        if not math.isfinite(self.threshold):
+            raise ValueError("Threshold must be a finite number")
+        self.window = int(window) if kind in WINDOWED_KINDS else 0
+        self.last_fired = 0.0
+        if kind in WINDOWED_KINDS and self.window <= 0:
+            raise ValueError("Window must be a positive number of seconds")
+        if kind == "volume" and self.window >= VOLUME_BASELINE:
+            raise ValueError(f"Volume window must be shorter than the {VOLUME_BASELINE}s baseline")
+
+    @property
+    def key(self):
+        return self.symbol, self.kind, self.window
+
+    def describe(self):
+        sym = self.symbol.upper()
+        if self.kind == "cross":
+            return f"{sym} crossed {self.threshold:,.4f}"
+        if self.kind == "change":
+            return f"{sym} moved {self.threshold:g}% in {self.window}s"
+        if self.kind == "volume":
+            return f"{sym} volume {self.threshold:g}x baseline in {self.window}s"
+        return f"{sym} spread >= {self.threshold:g} bps"
+
+    def to_dict(self):
+        return {"symbol": self.symbol, "kind": self.kind, "threshold": self.threshold, "window": self.window}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d["symbol"], d["kind"], d["threshold"], d.get("window", 0))
+
+    @classmethod
+    def parse(cls, symbol, text):
+        """Parse '<kind> <threshold> [window]', e.g. 'cross 65000', 'change 2.5 300' or 'volume 3 60'."""
+        parts = text.split()
+        if len(parts) not in (2, 3):
+            raise ValueError("Expected '<kind> <threshold> [window]'")
+        window = parts[2] if len(parts) == 3 else 60
+        return cls(symbol, parts[0].lower(), parts[1], window)
+
+
+class ThresholdIndex:
+    """Rules of one (symbol, kind, window) bucket, kept sorted by threshold."""
+
+    def __init__(self):
+        self.thresholds = []
+        self.rules = []
+
+    def __len__(self):
+        return len(self.rules)
+
+    def add(self, rule):
+        i = bisect.bisect_right(self.thresholds, rule.threshold)
+        self.thresholds.insert(i, rule.threshold)
+        self.rules.insert(i, rule)
+
+    def remove(self, rule):
+        i = bisect.bisect_left(self.thresholds, rule.threshold)
+        while i < len(self.rules) and self.thresholds[i] == rule.threshold:
+            if self.rules[i] is rule:
+                del self.thresholds[i]
+                del self.rules[i]
+                return
+            i += 1
+
+    def rising(self, prev, value):
+        """Rules with prev < threshold <= value."""
+        if value <= prev:
+            return []
+        lo = bisect.bisect_right(self.thresholds, prev)
+        hi = bisect.bisect_right(self.thresholds, value)
+        return self.rules[lo:hi]
+
+    def crossed(self, prev, value):
+        """Rules whose threshold lies between prev and value, in either direction."""
+        if value > prev:
+            return self.rising(prev, value)
+        lo = bisect.bisect_left(self.thresholds, value)
+        hi = bisect.bisect_left(self.thresholds, prev)
+        return self.rules[lo:hi]
+
+
+class AlertEngine:
+    """Evaluates alert rules on live stream data; each message costs O(log n) per matching bucket."""
+
+    def __init__(self, on_alert=None):
+        """on_alert(messages) is called once per stream message that fired any rules."""
+        self.on_alert = on_alert
+        self.lock = threading.Lock()
+        self.rules = {}  # id -> rule
+        self.index = {}  # (symbol, kind, window) -> ThresholdIndex
+        self.windows = {}  # (symbol, kind) -> {window: rule count} for windowed rules
+        self.last = {}  # (symbol, kind, window) -> last evaluated value
+        self.history = {}  # (symbol, window) -> deque of (ts, price)
+        self.volume = {}  # symbol -> [RollingVolume, first trade second]
+
+    # ---------------- Rules ----------------
+    def add_rule(self, rule):
+        with self.lock:
+            self.rules[rule.id] = rule
+            self.index.setdefault(rule.key, ThresholdIndex()).add(rule)
+            if rule.kind in WINDOWED_KINDS:
+                counts = self.windows.setdefault((rule.symbol, rule.kind), {})
+                counts[rule.window] = counts.get(rule.window, 0) + 1
+                if rule.kind == "volume" and counts[rule.window] == 1:
+                    self._reset_volume(rule.symbol)
+        return rule
+
+    def remove_rule(self, rule):
+        with self.lock:
+            if self.rules.pop(rule.id, None) is None:
+                return
+            bucket = self.index.get(rule.key)
+            if bucket is not None:
+                bucket.remove(rule)
+                if not bucket:
+                    del self.index[rule.key]
+                    self.last.pop(rule.key, None)
+            if rule.kind in WINDOWED_KINDS:
+                counts = self.windows[(rule.symbol, rule.kind)]
+                counts[rule.window] -= 1
+                if not counts[rule.window]:
+                    del counts[rule.window]
+                    self.history.pop((rule.symbol, rule.window), None)
+                    if rule.kind == "volume":
+                        self._reset_volume(rule.symbol)
+
+    def rules_for(self, symbol):
+        symbol = symbol.lower()
+        with self.lock:
+            return [r for r in self.rules.values() if r.symbol == symbol]
+
+    def load(self, path):
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            for d in data:
+                try:
+                    self.add_rule(AlertRule.from_dict(d))
+                except (KeyError, ValueError) as e:
+                    log("ALERT", f"Skipping invalid rule {d}: {e}")
+            log("ALERT", f"Loaded {len(self.rules)} rules")
+        except Exception as e:
+            log("ALERT", f"Error loading rules: {e}")
+
+    def save(self, path):
+        with self.lock:
+            data = [r.to_dict() for r in self.rules.values()]
+        try:
+            with open(path, "w") as f:
+                json.dump(data, f, indent=2)
+        except Exception as e:
+            log("ALERT", f"Error saving rules: {e}")
+
+    # ---------------- Stream hooks ----------------
+    def on_ticker(self, symbol, data):
+        symbol = symbol.lower()
+        price = float(data["c"])
+        now = time.time()
+        fired = []
+        with self.lock:
+            for window in self.windows.get((symbol, "change"), ()):
+                hist = self.history.setdefault((symbol, window), deque())
+                hist.append((now, price))
+                while hist[0][0] < now - window:
+                    hist.popleft()
+                ref = hist[0][1]
+                change = abs(price - ref) / ref * 100 if ref else 0.0
+                fired += self._rising((symbol, "change", window), change, now)
+        self._fire(fired)
+
+    def on_trade(self, symbol, data):
+        symbol = symbol.lower()
+        price = float(data["p"])
+        qty = float(data["q"])
+        now = time.time()
+        fired = []
+        with self.lock:
+            key = (symbol, "cross", 0)
+            bucket = self.index.get(key)
+            if bucket is not None:
+                prev = self.last.get(key)
+                self.last[key] = price
+                if prev is not None:
+                    fired += [(r, price) for r in bucket.crossed(prev, price) if self._ready(r, now)]
+            if symbol in self.volume:
+                fired += self._volume_spikes(symbol, data["T"] / 1000, qty, now)
+        self._fire(fired)
+
+    def on_depth(self, symbol, data):
+        symbol = symbol.lower()
+        key = (symbol, "spread", 0)
+        if key not in self.index or not data["bids"] or not data["asks"]:
+            return
+        bid = float(data["bids"][0][0])
+        ask = float(data["asks"][0][0])
+        spread = (ask - bid) / ((ask + bid) / 2) * 10_000
+        with self.lock:
+            fired = self._rising(key, spread, time.time())
+        self._fire(fired)
+
+    # ---------------- Internals ----------------
+    def _reset_volume(self, symbol):
+        """Rebuild the symbol's rolling volume buffer for the current set of rule windows."""
+        windows = self.windows.get((symbol, "volume"))
+        if windows:
+            self.volume[symbol] = [RollingVolume(tuple(sorted(windows)) + (VOLUME_BASELINE,)), None]
+        else:
+            self.volume.pop(symbol, None)
+
+    def _volume_spikes(self, symbol, ts, qty, now):
+        state = self.volume[symbol]
+        rolling = state[0]
+        rolling.add(ts, qty)
+        if state[1] is None:
+            state[1] = rolling.now
+        totals = rolling.totals()
+        # Until a full baseline has elapsed, average over the time actually covered
+        elapsed = min(VOLUME_BASELINE, rolling.now - state[1] + 1)
+        fired = []
+        for window in self.windows[(symbol, "volume")]:
+            if elapsed < window * VOLUME_WARMUP:
+                continue
+            baseline = totals[VOLUME_BASELINE] * window / elapsed
+            ratio = totals[window] / baseline if baseline else 0.0
+            fired += self._rising((symbol, "volume", window), ratio, now)
+        return fired
+
+    def _ready(self, rule, now):
+        if now - rule.last_fired < COOLDOWN:
+            return False
+        rule.last_fired = now
+        return True
+
+    def _rising(self, key, value, now):
+        """Fire rules whose threshold the metric rose through since the last evaluation."""
+        bucket = self.index.get(key)
+        if bucket is None:
+            return []
+        prev = self.last.get(key, 0.0)
+        self.last[key] = value
+        return [(r, value) for r in bucket.rising(prev, value) if self._ready(r, now)]
+
+    def _fire(self, fired):
+        """Log one message's fired rules with a single file append and hand them to on_alert as one batch."""
+        if not fired:
+            return
+        now = datetime.now()
+        stamp, iso = now.strftime("%H:%M:%S"), now.isoformat()
+        messages = []
+        lines = []
+        for rule, value in fired:
+            messages.append(f"{stamp} {rule.describe()} ({value:,.4f})")
+            lines.append(f"{iso} {rule.describe()} ({value:,.4f})\n")
+        log("ALERT", messages[0] if len(messages) == 1 else f"{len(messages)} alerts, first: {messages[0]}")
+        try:
+            with open(ALERT_LOG_FILE, "a") as f:
+                f.writelines(lines)
+        except Exception as e:
+            log("ALERT", f"Error writing alert log: {e}")
+        if self.on_alert:
+            self.on_alert(messages)
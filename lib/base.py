@@ -1,16 +1,109 @@
+import json
+import threading
+import websocket
 from .debug import log
 
+WS_URL = "wss://stream.binance.com:9443/ws"
+
 class BasePanel:
-    """Base class for panels with WebSocket and stop logic."""
-    def __init__(self):
+    """Base class for panels with WebSocket and stop logic.
+
+    With a StreamHub the panel's stream rides the shared combined socket; without one it opens its own.
+    With a RedrawScheduler, UI updates posted from stream threads are coalesced per frame.
+    """
+    def __init__(self, hub=None, scheduler=None):
         self.running = True
         self.ws = None
+        self.hub = hub
+        self.scheduler = scheduler
+        self.stream = None  # e.g. "btcusdt@trade"; panels fed only by listeners leave it unset
+        self.listeners = []
+        self.paused = False
+        self.rendering = True
 
-    def stop(self):
-        log(self.__class__.__name__.upper(), "Stopping")
-        self.running = False
+    def add_listener(self, callback):
+        """Register callback(data), called from the WebSocket thread for every parsed message."""
+        self.listeners.append(callback)
+
+    def notify(self, data):
+        for callback in self.listeners:
+            try:
+                callback(data)
+            except Exception as e:
+                log(self.__class__.__name__.upper(), f"Listener error {e}")
+
+    # ---------------- Feed ----------------
+    def connect(self):
+        if not self.stream:
+            return
+        if self.hub:
+            self.hub.subscribe(self.stream, self.on_data)
+        else:
+            self.ws = websocket.WebSocketApp(
+                f"{WS_URL}/{self.stream}",
+                on_message=self.on_message,
+                on_error=self.on_error,
+                on_close=self.on_close_ws
+            )
+            threading.Thread(target=self.ws.run_forever, daemon=True).start()
+
+    def disconnect(self):
+        if self.hub and self.stream:
+            self.hub.unsubscribe(self.stream, self.on_data)
         try:
             if self.ws:
                 self.ws.close()
         except:
             pass
+
+    def on_message(self, ws, message):
+        try:
+            self.on_data(json.loads(message))
+        except Exception as e:
+            log(self.__class__.__name__.upper(), f"Parse error {e}")
+
+    def on_data(self, data):
+        if not self.running or self.paused:
+            return
+        self.notify(data)
+        try:
+            self.handle(data)
+        except Exception as e:
+            log(self.__class__.__name__.upper(), f"Error {e}")
+
+    def handle(self, data):
+        """Process one parsed message on the stream thread; panels override this."""
+
+    def post(self, func, *args):
+        """Run func(*args) on the Tk thread; with a scheduler only the latest call per frame runs."""
+        if self.scheduler:
+            self.scheduler.request((id(self), func.__name__), lambda: func(*args))
+        else:
+            self.parent.after(0, lambda: func(*args))
+
+    def on_error(self, ws, error):
+        log(self.__class__.__name__.upper(), f"WebSocket error {error}")
+
+    def on_close_ws(self, ws, *args):
+        log(self.__class__.__name__.upper(), "WebSocket closed")
+
+    # ---------------- Lifecycle ----------------
+    def pause(self):
+        """Drop the feed while nothing needs it; resume() reconnects and gets a fresh snapshot."""
+        if self.paused or not self.running:
+            return
+        log(self.__class__.__name__.upper(), "Pausing feed")
+        self.paused = True
+        self.disconnect()
+
+    def resume(self):
+        if not self.paused or not self.running:
+            return
+        log(self.__class__.__name__.upper(), "Resuming feed")
+        self.paused = False
+        self.connect()
+
+    def stop(self):
+        log(self.__class__.__name__.upper(), "Stopping")
+        self.running = False
+        self.disconnect()
@@ -1,19 +1,54 @@
 import tkinter as tk
+import threading
 from .debug import log
 
 class BasePanel:
     """Base class for all panels with a Tkinter frame and stop logic."""
-    def __init__(self, parent):
+    def __init__(self, parent, scheduler=None):
         self.parent = parent
+        self.scheduler = scheduler
         self.running = True
         self.frame = tk.Frame(parent)
+        self.listeners = []
+        self.paused = False
+        self.rendering = True
+        self.wake = threading.Event()
+
+    def add_listener(self, callback):
+        """Register callback(data), called from the worker thread for every fetched payload."""
+        self.listeners.append(callback)
+
+    def notify(self, data):
+        for callback in self.listeners:
+            try:
+                callback(data)
+            except Exception as e:
+                log("BASE_PANEL", f"Listener error {e}")
     
     def safe_update(self, func, *args, **kwargs):
-        """Safely update GUI from threads."""
+        """Safely update GUI from threads; with a shared scheduler only the latest call per frame runs."""
         if self.running and getattr(self, "frame", None) and self.frame.winfo_exists():
-            self.parent.after(0, lambda: func(*args, **kwargs))
+            if self.scheduler:
+                self.scheduler.request((id(self), func.__name__), lambda: func(*args, **kwargs))
+            else:
+                self.parent.after(0, lambda: func(*args, **kwargs))
     
+    def pause(self):
+        """Suspend background work while nothing needs the panel."""
+        if not self.paused:
+            log("BASE_PANEL", f"Pausing {self.__class__.__name__}")
+        self.paused = True
+
+    def resume(self):
+        """Resume background work; only a paused worker is woken, so it catches up without an extra fetch."""
+        if not self.paused:
+            return
+        log("BASE_PANEL", f"Resuming {self.__class__.__name__}")
+        self.paused = False
+        self.wake.set()
+
     def stop(self):
         """Stop panel activity safely."""
         log("BASE_PANEL", f"Stopping {self.__class__.__name__}")
         self.running = False
+        self.wake.set()
@@ -0,0 +1,172 @@
+import itertools
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from .debug import log
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+CAPTURE_DIR = "capture"
+QUEUE_SIZE = 10_000  # messages; capture drops instead of blocking when full
+BATCH_ROWS = 5_000
+FLUSH_INTERVAL = 30  # seconds
+DAY_MS = 24 * 60 * 60 * 1000
+
+# Column layout per message kind; the first column is the time in ms that rows are partitioned by date on:
+#   trade, ticker - exchange event time (E)
+#   depth         - local receive time, since partial depth payloads carry no E
+#   kline         - candle open time, so a candle lands in the date it opened on
+COLUMNS = {
+    "trade": [("event_time", "int64"), ("trade_time", "int64"), ("trade_id", "int64"),
+              ("price", "float64"), ("qty", "float64"), ("buyer_maker", "bool_")],
+    "ticker": [("event_time", "int64"), ("last", "float64"), ("change_pct", "float64"),
+               ("volume", "float64"), ("quote_volume", "float64")],
+    "depth": [("receive_time", "int64"), ("last_update_id", "int64"), ("side", "string"),
+              ("level", "int8"), ("price", "float64"), ("qty", "float64")],
+    "kline": [("open_time", "int64"), ("interval", "string"), ("open", "float64"), ("high", "float64"),
+              ("low", "float64"), ("close", "float64"), ("volume", "float64"), ("close_time", "int64"),
+              ("quote_volume", "float64"), ("trades", "int64")],
+}
+
+
+# ================= NORMALIZERS =================
+def normalize_trade(data):
+    return [(data["E"], data["T"], data["t"], float(data["p"]), float(data["q"]), data["m"])]
+
+
+def normalize_ticker(data):
+    return [(data["E"], float(data["c"]), float(data["P"]), float(data["v"]), float(data["q"]))]
+
+
+def normalize_depth(data, received_ms):
+    rows = []
+    for side in ("bids", "asks"):
+        for level, (p, q) in enumerate(data[side]):
+            rows.append((received_ms, data["lastUpdateId"], side[:-1], level, float(p), float(q)))
+    return rows
+
+
+def normalize_kline(k, interval):
+    return (k[0], interval, float(k[1]), float(k[2]), float(k[3]), float(k[4]),
+            float(k[5]), k[6], float(k[7]), int(k[8]))
+
+
+class MarketCapture:
+    """Batches stream messages into columns and writes Parquet files from a background thread.
+
+    Layout: <root>/<kind>/symbol=<SYMBOL>/date=<YYYY-MM-DD>/part-<ms>-<n>.parquet
+    """
+
+    def __init__(self, root=CAPTURE_DIR, batch_rows=BATCH_ROWS, flush_interval=FLUSH_INTERVAL):
+        if pa is None:
+            raise RuntimeError("pyarrow is required for market data capture")
+        self.root = root
+        self.batch_rows = batch_rows
+        self.flush_interval = flush_interval
+        self.schemas = {
+            kind: pa.schema([(name, getattr(pa, type_name)()) for name, type_name in cols])
+            for kind, cols in COLUMNS.items()
+        }
+        self.queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self.batches = {}  # (kind, symbol, date) -> (columns, first_added)
+        self.dates = {}  # UTC day number -> "YYYY-MM-DD"
+        self.last_kline = {}  # (symbol, interval) -> open time of the newest captured candle
+        self.dropped = 0
+        self.parts = itertools.count()
+        self.running = True
+
+        log("CAPTURE", f"Capturing market data to {os.path.abspath(root)}")
+        self.thread = threading.Thread(target=self.writer_loop, daemon=True)
+        self.thread.start()
+
+    # ---------------- Producers (any thread, never block) ----------------
+    def submit(self, kind, symbol, rows):
+        if not self.running or not rows:
+            return
+        try:
+            self.queue.put_nowait((kind, symbol.upper(), rows))
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                log("CAPTURE", f"Queue full, dropped {self.dropped} messages so far")
+
+    def on_trade(self, symbol, data):
+        self.submit("trade", symbol, normalize_trade(data))
+
+    def on_ticker(self, symbol, data):
+        self.submit("ticker", symbol, normalize_ticker(data))
+
+    def on_depth(self, symbol, data):
+        self.submit("depth", symbol, normalize_depth(data, int(time.time() * 1000)))
+
+    def on_klines(self, symbol, interval, klines):
+        """Capture closed candles only, each once, from the repeated kline windows."""
+        key = (symbol.upper(), interval)
+        last = self.last_kline.get(key, 0)
+        now_ms = int(time.time() * 1000)
+        rows = [normalize_kline(k, interval) for k in klines if k[0] > last and k[6] < now_ms]
+        if rows:
+            self.last_kline[key] = rows[-1][0]
+            self.submit("kline", symbol, rows)
+
+    # ---------------- Writer thread ----------------
+    def writer_loop(self):
+        while self.running or not self.queue.empty():
+            try:
+                kind, symbol, rows = self.queue.get(timeout=1)
+                self.append(kind, symbol, rows)
+            except queue.Empty:
+                pass
+            except Exception as e:
+                log("CAPTURE", f"Error {e}")
+            self.flush(force=False)
+        self.flush(force=True)
+
+    def date_of(self, ms):
+        """UTC partition date of a millisecond timestamp, cached per day."""
+        day = ms // DAY_MS
+        date = self.dates.get(day)
+        if date is None:
+            date = self.dates[day] = datetime.fromtimestamp(day * DAY_MS / 1000, tz=timezone.utc).strftime("%Y-%m-%d")
+        return date
+
+    def append(self, kind, symbol, rows):
+        # Rows are partitioned by their own time: a kline window or a batch can span midnight UTC
+        for row in rows:
+            key = (kind, symbol, self.date_of(row[0]))
+            if key not in self.batches:
+                self.batches[key] = ([[] for _ in COLUMNS[kind]], time.time())
+            for col, value in zip(self.batches[key][0], row):
+                col.append(value)
+
+    def flush(self, force):
+        now = time.time()
+        for key in list(self.batches):
+            columns, first_added = self.batches[key]
+            if force or len(columns[0]) >= self.batch_rows or now - first_added >= self.flush_interval:
+                del self.batches[key]
+                self.write(key, columns)
+
+    def write(self, key, columns):
+        kind, symbol, date = key
+        schema = self.schemas[kind]
+        path = os.path.join(self.root, kind, f"symbol={symbol}", f"date={date}")
+        try:
+            os.makedirs(path, exist_ok=True)
+            table = pa.Table.from_arrays([pa.array(col, type=field.type) for col, field in zip(columns, schema)],
+                                         schema=schema)
+            pq.write_table(table, os.path.join(path, f"part-{int(time.time() * 1000)}-{next(self.parts)}.parquet"))
+        except Exception as e:
+            log("CAPTURE", f"Error writing {kind} {symbol} {date}: {e}")
+
+    def stop(self):
+        log("CAPTURE", "Stopping, flushing pending batches")
+        self.running = False
+        self.thread.join(timeout=10)
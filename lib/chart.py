@@ -5,7 +5,9 @@ import matplotlib.patches as patches
 import numpy as np
 import requests
 from datetime import datetime
+from functools import lru_cache
 import threading
+import time
 from matplotlib.ticker import FuncFormatter, MaxNLocator
 from .debug import log
 from .base_panel import BasePanel
@@ -22,14 +24,32 @@ LABEL_FONT_SIZE = 9
 MIN_CANDLE_RATIO = 0.01
 THRESHOLD = 0.1  # percent
 UPDATE_INTERVAL = 3  # seconds
+# Shared by every chart so grid tiles reuse the same font dicts
+LABEL_FONT = {"family": "Courier New", "size": LABEL_FONT_SIZE, "weight": "bold", "color": GRAY}
+PRICE_FONT = {"family": "Courier New", "size": PRICE_FONT_SIZE, "weight": "bold"}
+INTERVAL_MS = {"s": 1_000, "m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000}
 
 
 class CryptoChart(BasePanel):
-    def __init__(self, parent, symbol, interval="1m", limit=60):
-        super().__init__(parent)
+    """Candlestick and volume chart.
+
+    Without a hub the worker polls REST every UPDATE_INTERVAL. With a StreamHub, candles come from the
+    shared <symbol>@kline_<interval> stream and REST is only used for the initial and catch-up windows.
+    """
+
+    def __init__(self, parent, symbol, interval="1m", limit=60, session=None, scheduler=None, hub=None):
+        super().__init__(parent, scheduler)
         self.symbol = symbol.upper()
+        self.session = session or requests
+        self.hub = hub
         self.interval = interval
         self.limit = limit
+        self.interval_ms = int(interval[:-1]) * INTERVAL_MS.get(interval[-1], 0)
+        self.stream = f"{symbol.lower()}@kline_{interval}"
+        self.klines = []
+        self.klines_lock = threading.Lock()
+        self.synced = False  # cache is current up to the stream; stream candles are merged only then
+        self.subscribed = False
         self.prev_price = None
 
         log("CHART", f"Initializing chart for {self.symbol}")
@@ -52,18 +72,23 @@ class CryptoChart(BasePanel):
         self.canvas2.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
         # Apply formatters
-        self.ax.yaxis.set_major_formatter(FuncFormatter(self.price_formatter))
+        self.price_fmt = FuncFormatter(self.price_formatter)
+        self.volume_fmt = FuncFormatter(self.volume_formatter)
+        self.ax.yaxis.set_major_formatter(self.price_fmt)
         self.ax.yaxis.tick_right()  # price ticks right (label stays left)
 
-        self.ax2.yaxis.set_major_formatter(FuncFormatter(self.volume_formatter))
+        self.ax2.yaxis.set_major_formatter(self.volume_fmt)
         self.ax2.yaxis.tick_right()  # volume ticks right
         self.ax2.yaxis.set_label_position("left")  # FORCE label left
 
         # Start update loop
+        self.subscribe()
         threading.Thread(target=self.update_loop, daemon=True).start()
 
     # ---------------- Formatters ----------------
+    # Cached across all charts: tiles with similar ranges format the same tick values
     @staticmethod
+    @lru_cache(maxsize=4096)
     def price_formatter(x, pos):
         if x >= 10:
             return f"{x:,.0f}"
@@ -73,6 +98,7 @@ class CryptoChart(BasePanel):
             return f"{x:,.4f}"
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def volume_formatter(x, pos):
         if x >= 1_000_000:
             return f"{x/1_000_000:.0f}M"
@@ -85,13 +111,63 @@ class CryptoChart(BasePanel):
 
     # ---------------- Fetch klines ----------------
     def fetch_klines(self):
+        """Return the latest `limit` candles, fetching only those since the cached last candle when possible."""
+        url = "https://api.binance.com/api/v3/klines"
+        params = {"symbol": self.symbol, "interval": self.interval, "limit": self.limit}
+        # After a short pause only the missed candles are requested; after a long one, a full window
+        if self.klines and time.time() * 1000 - self.klines[-1][0] < self.limit * self.interval_ms:
+            params["startTime"] = self.klines[-1][0]
         try:
-            url = "https://api.binance.com/api/v3/klines"
-            params = {"symbol": self.symbol, "interval": self.interval, "limit": self.limit}
-            return requests.get(url, params=params, timeout=5).json()
+            fresh = self.session.get(url, params=params, timeout=5).json()
         except Exception as e:
             log("CHART", f"Error fetching klines: {e}")
             return []
+        if not isinstance(fresh, list) or not fresh:
+            log("CHART", f"Unexpected klines response: {fresh}")
+            return []
+
+        with self.klines_lock:
+            if "startTime" in params:
+                fresh = [k for k in self.klines if k[0] < fresh[0][0]] + fresh
+            self.klines = fresh[-self.limit:]
+            return list(self.klines)
+
+    # ---------------- Kline stream (hub thread) ----------------
+    def subscribe(self):
+        if self.hub and not self.subscribed:
+            self.subscribed = True
+            self.hub.subscribe(self.stream, self.on_kline)
+
+    def unsubscribe(self):
+        if self.hub and self.subscribed:
+            self.subscribed = False
+            self.hub.unsubscribe(self.stream, self.on_kline)
+
+    def on_kline(self, data):
+        # Until the REST catch-up lands, the cache may be missing candles, so updates are dropped;
+        # the next stream message (every 2s) brings the current candle again
+        if not self.running or self.paused or not self.synced:
+            return
+        k = data["k"]
+        candle = [k["t"], k["o"], k["h"], k["l"], k["c"], k["v"], k["T"], k["q"], k["n"], k["V"], k["Q"], "0"]
+        with self.klines_lock:
+            last = self.klines[-1][0]
+            if candle[0] == last:
+                self.klines[-1] = candle
+            elif candle[0] == last + self.interval_ms:
+                self.klines.append(candle)
+                del self.klines[:-self.limit]
+            elif candle[0] > last:
+                # Candles were missed (e.g. while the hub reconnected): let the worker refetch
+                self.synced = False
+                self.wake.set()
+                return
+            else:
+                return
+            klines = list(self.klines)
+        self.notify(klines)
+        if self.rendering:
+            self.safe_update(self.plot, klines)
 
     # ---------------- Plotting ----------------
     def plot(self, klines):
@@ -140,15 +216,11 @@ class CryptoChart(BasePanel):
             transform=self.ax.get_yaxis_transform(),
             color=line_color,
             va="center", ha="left",
-            fontdict={"family": "Courier New", "size": PRICE_FONT_SIZE, "weight": "bold"},
+            fontdict=PRICE_FONT,
             bbox=dict(facecolor=DARK_BG, alpha=0.9)
         )
 
-        self.ax.set_ylabel(
-            "Price",
-            fontdict={"family": "Courier New", "size": LABEL_FONT_SIZE,
-                      "weight": "bold", "color": GRAY}
-        )
+        self.ax.set_ylabel("Price", fontdict=LABEL_FONT)
         self.ax.tick_params(axis='y', colors=GRAY)
         self.ax.grid(True, color="gray", linestyle="--", linewidth=0.3)
         self.ax.get_xaxis().set_visible(False)
@@ -162,7 +234,7 @@ class CryptoChart(BasePanel):
 
         self.ax2.yaxis.tick_right()
         self.ax2.yaxis.set_label_position("left")
-        self.ax2.yaxis.set_major_formatter(FuncFormatter(self.volume_formatter))
+        self.ax2.yaxis.set_major_formatter(self.volume_fmt)
         self.ax2.yaxis.set_major_locator(MaxNLocator(nbins=6, prune='both'))
 
         tick_spacing = max(1, len(ts) // 6)
@@ -172,15 +244,10 @@ class CryptoChart(BasePanel):
             tick_labels[::tick_spacing],
             rotation=30,
             ha="right",
-            fontdict={"family": "Courier New", "size": LABEL_FONT_SIZE,
-                      "weight": "bold", "color": GRAY}
+            fontdict=LABEL_FONT
         )
 
-        self.ax2.set_ylabel(
-            "Volume",
-            fontdict={"family": "Courier New", "size": LABEL_FONT_SIZE,
-                      "weight": "bold", "color": GRAY}
-        )
+        self.ax2.set_ylabel("Volume", fontdict=LABEL_FONT)
         self.ax2.tick_params(axis='y', colors=GRAY)
         self.ax2.tick_params(axis='x', colors=GRAY)
         self.ax2.grid(True, color="gray", linestyle="--", linewidth=0.3)
@@ -195,7 +262,30 @@ class CryptoChart(BasePanel):
     # ---------------- Update Loop ----------------
     def update_loop(self):
         while self.running:
-            klines = self.fetch_klines()
-            if klines:
-                self.safe_update(self.plot, klines)
-            threading.Event().wait(UPDATE_INTERVAL)
+            if not self.paused and not self.synced:
+                klines = self.fetch_klines()
+                if klines:
+                    # With a hub the stream takes over; without one, keep polling
+                    self.synced = self.hub is not None
+                    self.notify(klines)
+                    if self.rendering:
+                        self.safe_update(self.plot, klines)
+            # resume(), stop() and a detected stream gap set the event to cut the wait short
+            self.wake.wait(None if self.paused or self.synced else UPDATE_INTERVAL)
+            self.wake.clear()
+
+    # ---------------- Lifecycle ----------------
+    def pause(self):
+        super().pause()
+        self.synced = False
+        self.unsubscribe()
+
+    def resume(self):
+        # Subscribe before the catch-up fetch so no candle falls between the two
+        if self.paused and self.running:
+            self.subscribe()
+        super().resume()
+
+    def stop(self):
+        super().stop()
+        self.unsubscribe()
@@ -0,0 +1,276 @@
+import tkinter as tk
+import threading
+import time
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.ticker import FuncFormatter, MaxNLocator
+from .debug import log
+from .base_panel import BasePanel
+from .chart import CryptoChart, LABEL_FONT
+
+# ================= COLORS =================
+DARK_BG = "#242a24"
+GRAY = "#b5b5b5"
+YELLOW = "#ffc800"
+DARK_YELLOW = "#8d6e00"
+
+LABEL_FONT_SIZE = 9
+HISTORY_SLICES = 3 * 60 * 60  # one slice per depth message (1s) -> 3 hours
+PRICE_BUCKETS = 400
+BOOK_BUCKETS = 40  # the first snapshot's price span is spread over this many buckets
+RECENTER_MARGIN = 0.1  # recenter when mid price enters the outer 10% of the grid
+VIEW_SLICES = 600  # image columns shown on screen
+ZOOM_STEPS = {"10m": 1, "1h": 6, "3h": 18}  # slices folded into each column; 3h covers HISTORY_SLICES
+Y_PAD_BUCKETS = 2  # empty buckets kept above and below the visible liquidity
+REDRAW_MS = 500
+GAP_SECONDS = 2  # feed silence longer than this is recorded as empty slices
+
+
+class DepthHistory:
+    """Fixed-size ring buffer of resting quantity, time slices x price buckets.
+
+    Bucket width starts from the first snapshot: its price span over BOOK_BUCKETS, but never finer
+    than the observed tick. When the mid price walks off the grid while history is still on it, the
+    grid is re-binned at a coarser width instead of dropping those levels, so it widens to the
+    range the market actually covered over the retention period.
+    """
+
+    def __init__(self, slices=HISTORY_SLICES, buckets=PRICE_BUCKETS, book_buckets=BOOK_BUCKETS):
+        self.slices = slices
+        self.buckets = buckets
+        self.book_buckets = book_buckets
+        self.grid = np.zeros((slices, buckets), dtype=np.float32)
+        self.scratch = np.empty_like(self.grid)  # reused by window(), which runs on the Tk thread only
+        self.head = 0  # next slice to write
+        self.count = 0
+        self.base_price = None  # lower edge of bucket 0
+        self.bucket_size = None
+        self.lock = threading.Lock()
+
+    def anchor(self, mid, prices):
+        prices = np.unique(prices)
+        steps = np.diff(prices)
+        steps = steps[steps > 0]
+        tick = steps.min() if len(steps) else mid * 1e-5
+        span = prices[-1] - prices[0]
+        self.bucket_size = max(tick, span / self.book_buckets)
+        self.base_price = mid - self.bucket_size * self.buckets / 2
+
+    def recenter(self, mid):
+        """Shift the price axis in place so mid is centered; re-bin instead if that would drop history."""
+        shift = int(round((mid - self.base_price) / self.bucket_size)) - self.buckets // 2
+        if shift == 0:
+            return
+        if abs(shift) >= self.buckets:
+            dropped = self.grid
+        elif shift > 0:
+            dropped = self.grid[:, :shift]
+        else:
+            dropped = self.grid[:, shift:]
+        if dropped.any():
+            self.rebin(mid)
+            return
+
+        if abs(shift) >= self.buckets:
+            self.grid.fill(0)
+        elif shift > 0:
+            self.grid[:, :-shift] = self.grid[:, shift:]
+            self.grid[:, -shift:] = 0
+        else:
+            self.grid[:, -shift:] = self.grid[:, :shift]
+            self.grid[:, :-shift] = 0
+        self.base_price += shift * self.bucket_size
+
+    def rebin(self, mid):
+        """Merge buckets (doubling the width until the stored levels fit) around a grid centered on mid."""
+        filled = np.flatnonzero(self.grid.any(axis=0))
+        factor = 2
+        while True:
+            size = self.bucket_size * factor
+            # Offset in old buckets, so every old bucket lands inside exactly one new bucket
+            offset = int(round((mid - size * self.buckets / 2 - self.base_price) / self.bucket_size))
+            if (filled[0] - offset) // factor >= 0 and (filled[-1] - offset) // factor < self.buckets:
+                break
+            factor *= 2
+
+        target = (np.arange(self.buckets) - offset) // factor
+        grid = np.zeros_like(self.grid)
+        for r in range(factor):
+            # Old buckets of one residue map to distinct new buckets, so fancy-index += is safe
+            cols = np.flatnonzero(((np.arange(self.buckets) - offset) % factor == r)
+                                  & (target >= 0) & (target < self.buckets))
+            grid[:, target[cols]] += self.grid[:, cols]
+        self.grid = grid
+        self.base_price += offset * self.bucket_size
+        self.bucket_size = size
+        log("HEATMAP", f"Re-binned price axis to {size:g} per bucket")
+
+    def push(self, bids, asks):
+        """Write one depth snapshot ([[price, qty], ...] as strings or floats) as the newest slice."""
+        if not bids or not asks:
+            return
+        levels = np.asarray(bids + asks, dtype=np.float64)
+        mid = (levels[0, 0] + levels[len(bids), 0]) / 2
+
+        with self.lock:
+            if self.base_price is None:
+                self.anchor(mid, levels[:, 0])
+            else:
+                pos = (mid - self.base_price) / self.bucket_size
+                if not self.buckets * RECENTER_MARGIN <= pos <= self.buckets * (1 - RECENTER_MARGIN):
+                    self.recenter(mid)
+
+            row = self.grid[self.head]
+            row.fill(0)
+            idx = np.floor((levels[:, 0] - self.base_price) / self.bucket_size).astype(np.intp)
+            mask = (idx >= 0) & (idx < self.buckets)
+            np.add.at(row, idx[mask], levels[mask, 1])
+
+            self.head = (self.head + 1) % self.slices
+            self.count = min(self.count + 1, self.slices)
+
+    def skip(self, n):
+        """Advance n empty slices, e.g. for the time the depth feed was paused."""
+        n = min(n, self.slices)
+        with self.lock:
+            self.grid[(self.head + np.arange(n)) % self.slices] = 0
+            self.head = (self.head + n) % self.slices
+            self.count = min(self.count + n, self.slices)
+
+    def window(self, n, step=1):
+        """Return the newest n * step slices as a (buckets, n) array, oldest first, zero padded on the left.
+
+        Each column holds the largest quantity seen in its `step` slices, so walls stay visible when zoomed out.
+        """
+        span = n * step
+        view = self.scratch[:span]
+        with self.lock:
+            filled = min(span, self.count)
+            view[:span - filled] = 0
+            # Copy the ring in chronological order as at most two contiguous slices
+            start = self.head - filled
+            if start >= 0:
+                view[span - filled:] = self.grid[start:self.head]
+            else:
+                view[span - filled:span - self.head] = self.grid[start:]
+                view[span - self.head:] = self.grid[:self.head]
+            base_price, bucket_size = self.base_price, self.bucket_size
+        return view.reshape(n, step, self.buckets).max(axis=1).T, base_price, bucket_size
+
+
+class DepthHeatmapPanel(BasePanel):
+    """Liquidity over price and time, fed by OrderBookPanel depth messages."""
+
+    def __init__(self, parent, symbol, view_slices=VIEW_SLICES, scheduler=None):
+        super().__init__(parent, scheduler)
+        self.symbol = symbol.upper()
+        self.view_slices = view_slices
+        self.step = ZOOM_STEPS["10m"]
+        self.history = DepthHistory()
+        self.dirty = False
+        self.data_visible = True
+        self.last_push = None
+
+        log("HEATMAP", f"Initializing depth heatmap for {self.symbol}")
+
+        self.frame.config(bg=DARK_BG)
+
+        zoom_bar = tk.Frame(self.frame, bg=DARK_BG)
+        zoom_bar.pack(fill=tk.X)
+        self.zoom_buttons = {}
+        for name in reversed(list(ZOOM_STEPS)):
+            btn = tk.Button(zoom_bar, text=name, font=("Courier New", 9, "bold"), fg="black", relief="flat",
+                            width=4, command=lambda n=name: self.set_zoom(n))
+            btn.pack(side=tk.RIGHT, padx=2, pady=2)
+            self.zoom_buttons[name] = btn
+
+        self.fig = Figure(figsize=(6, 2), dpi=100, facecolor=DARK_BG)
+        self.ax = self.fig.add_subplot(111)
+        self.ax.set_facecolor(DARK_BG)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.frame)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+        # Single image artist, updated in place on every redraw
+        self.image = self.ax.imshow(
+            np.zeros((self.history.buckets, self.view_slices), dtype=np.float32),
+            origin="lower", aspect="auto", cmap="inferno", interpolation="nearest",
+            extent=(-self.view_slices, 0, 0, 1)
+        )
+
+        for spine in self.ax.spines.values():
+            spine.set_color(GRAY)
+        self.ax.yaxis.tick_right()
+        self.ax.yaxis.set_major_formatter(FuncFormatter(CryptoChart.price_formatter))
+        self.ax.yaxis.set_major_locator(MaxNLocator(nbins=6, prune='both'))
+        self.ax.tick_params(axis='both', colors=GRAY, labelsize=LABEL_FONT_SIZE)
+        self.ax.set_xlabel("Seconds ago", fontdict=LABEL_FONT)
+        self.fig.tight_layout(pad=0.3)
+        self.set_zoom("10m")
+
+        # With a shared scheduler redraws are requested per depth message instead of polled
+        if scheduler is None:
+            self.frame.after(REDRAW_MS, self.redraw_loop)
+
+    # ---------------- Feed ----------------
+    def on_depth(self, data):
+        """OrderBookPanel listener, runs on the WebSocket thread."""
+        if not self.running:
+            return
+        try:
+            now = time.time()
+            if self.last_push is not None and now - self.last_push > GAP_SECONDS:
+                self.history.skip(int(now - self.last_push) - 1)
+            self.last_push = now
+            self.history.push(data["bids"], data["asks"])
+            self.dirty = True
+            if self.scheduler:
+                self.safe_update(self.refresh)
+        except Exception as e:
+            log("HEATMAP", f"Error {e}")
+
+    # ---------------- Rendering ----------------
+    def redraw(self):
+        view, base_price, bucket_size = self.history.window(self.view_slices, self.step)
+        if base_price is None:
+            return
+        top = base_price + bucket_size * self.history.buckets
+        levels = np.log1p(view)
+        self.image.set_data(levels)
+        self.image.set_clim(0, max(float(levels.max()), 1e-6))
+        self.image.set_extent((-self.view_slices * self.step, 0, base_price, top))
+        self.ax.set_xlim(-self.view_slices * self.step, 0)
+
+        # Zoom the price axis to the buckets the book actually covered in this window
+        filled = np.flatnonzero(view.any(axis=1))
+        if len(filled):
+            low = base_price + max(filled[0] - Y_PAD_BUCKETS, 0) * bucket_size
+            high = base_price + min(filled[-1] + 1 + Y_PAD_BUCKETS, self.history.buckets) * bucket_size
+        else:
+            low, high = base_price, top
+        self.ax.set_ylim(low, high)
+        self.canvas.draw_idle()
+
+    def refresh(self):
+        if self.running and self.dirty and self.data_visible and self.frame.winfo_exists():
+            self.dirty = False
+            self.redraw()
+
+    def redraw_loop(self):
+        if not self.running or not self.frame.winfo_exists():
+            return
+        self.refresh()
+        self.frame.after(REDRAW_MS, self.redraw_loop)
+
+    def set_zoom(self, name):
+        self.step = ZOOM_STEPS[name]
+        for n, btn in self.zoom_buttons.items():
+            btn.config(bg=YELLOW if n == name else DARK_YELLOW)
+        self.dirty = True
+        self.refresh()
+
+    def set_visible(self, visible: bool):
+        self.data_visible = visible
+        self.dirty = True
+        if visible and self.scheduler:
+            self.safe_update(self.refresh)
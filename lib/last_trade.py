@@ -1,7 +1,4 @@
 import tkinter as tk
-import json
-import threading
-import websocket
 from .debug import log
 from .base import BasePanel
 
@@ -13,10 +10,11 @@ FONT = ("Courier New", 11, "bold")
 
 
 class LastTradePanel(BasePanel):
-    def __init__(self, parent, symbol):
-        super().__init__()
+    def __init__(self, parent, symbol, hub=None, scheduler=None):
+        super().__init__(hub, scheduler)
         self.parent = parent
         self.symbol = symbol.lower()
+        self.stream = f"{self.symbol}@trade"
 
         self.frame = tk.Frame(parent, bg=DARK_BG, padx=10, pady=10)
 
@@ -25,27 +23,17 @@ class LastTradePanel(BasePanel):
 
         log("TRADE", f"Starting WebSocket for {self.symbol.upper()}")
 
-        self.ws = websocket.WebSocketApp(
-            f"wss://stream.binance.com:9443/ws/{self.symbol}@trade",
-            on_message=self.on_message,
-            on_error=self.on_error,
-            on_close=self.on_close_ws
-        )
-        threading.Thread(target=self.ws.run_forever, daemon=True).start()
+        self.connect()
 
-    def on_message(self, ws, message):
-        if not self.running:
+    def handle(self, data):
+        if not self.rendering:
             return
-        try:
-            data = json.loads(message)
-            price = float(data["p"])
-            qty = float(data["q"])
-            trade_type = "SELL" if data["m"] else "BUY"
-            color = RED if trade_type == "SELL" else GREEN
-            text = f"Last trade : {trade_type:<5} {qty:>7,.4f} at ${price:,.3f}"
-            self.parent.after(0, lambda t=text, c=color: self.safe_update(t, c))
-        except Exception as e:
-            log("TRADE", f"Parse error {e}")
+        price = float(data["p"])
+        qty = float(data["q"])
+        trade_type = "SELL" if data["m"] else "BUY"
+        color = RED if trade_type == "SELL" else GREEN
+        text = f"Last trade : {trade_type:<5} {qty:>7,.4f} at ${price:,.3f}"
+        self.post(self.safe_update, text, color)
 
     def safe_update(self, text, color):
         if self.running and getattr(self, "label", None) and self.label.winfo_exists():
@@ -1,8 +1,4 @@
 import tkinter as tk
-import json
-import threading
-import websocket
-from .debug import log
 from .base import BasePanel
 
 DARK_BG = "#242a24"
@@ -16,10 +12,13 @@ FONT_SMALL = ("Courier New", 10, "bold")
 
 
 class OrderBookPanel(BasePanel):
-    def __init__(self, parent, symbol):
-        super().__init__()
+    def __init__(self, parent, symbol, hub=None, scheduler=None):
+        super().__init__(hub, scheduler)
         self.parent = parent
         self.symbol = symbol.lower()
+        # Each depth20 message is a full top-20 snapshot, so reconnecting is a complete resync.
+        # The panel shows the top 10; listeners such as the heatmap get all 20 levels.
+        self.stream = f"{self.symbol}@depth20@1000ms"
         self.data_visible = True
 
         self.frame = tk.Frame(parent, bg=DARK_BG, padx=10, pady=10)
@@ -39,25 +38,19 @@ class OrderBookPanel(BasePanel):
         self.bids_data.pack()
         self.asks_data.pack()
 
-        for _ in range(10):
-            tk.Label(self.bids_data, text="--", fg=LIGHT_GREEN, bg=DARK_BG, font=FONT_SMALL).pack(anchor="w")
-        for _ in range(10):
-            tk.Label(self.asks_data, text="--", fg=LIGHT_RED, bg=DARK_BG, font=FONT_SMALL).pack(anchor="w")
+        # Level labels are created once and updated in place
+        self.bid_labels = [tk.Label(self.bids_data, text="--", fg=LIGHT_GREEN, bg=DARK_BG, font=FONT_SMALL)
+                           for _ in range(10)]
+        self.ask_labels = [tk.Label(self.asks_data, text="--", fg=LIGHT_RED, bg=DARK_BG, font=FONT_SMALL)
+                           for _ in range(10)]
+        for label in self.bid_labels + self.ask_labels:
+            label.pack(anchor="w")
 
-        self.ws = websocket.WebSocketApp(
-            f"wss://stream.binance.com:9443/ws/{self.symbol}@depth10@1000ms",
-            on_message=self.on_message
-        )
-        threading.Thread(target=self.ws.run_forever, daemon=True).start()
+        self.connect()
 
-    def on_message(self, ws, message):
-        if not self.running:
-            return
-        try:
-            data = json.loads(message)
-            self.parent.after(0, lambda d=data: self.update_ui(d))
-        except Exception as e:
-            log("ORDERBOOK", f"Error {e}")
+    def handle(self, data):
+        if self.data_visible and self.rendering:
+            self.post(self.update_ui, data)
 
     @staticmethod
     def format_qty(qty: float) -> str:
@@ -69,20 +62,15 @@ class OrderBookPanel(BasePanel):
             return f"{qty:,.3f}"
 
     def update_ui(self, data):
-        if not self.running or not self.data_visible:
+        if not self.running or not self.data_visible or not self.frame.winfo_exists():
             return
-        for w in self.bids_data.winfo_children():
-            w.destroy()
-        for w in self.asks_data.winfo_children():
-            w.destroy()
-        for p, q in data["bids"]:
-            qty_str = self.format_qty(float(q))
-            tk.Label(self.bids_data, text=f"${float(p):>11,.3f}  Qty {qty_str:>8}",
-                     fg=LIGHT_GREEN, bg=DARK_BG, font=FONT_SMALL).pack(anchor="w")
-        for p, q in data["asks"]:
-            qty_str = self.format_qty(float(q))
-            tk.Label(self.asks_data, text=f"${float(p):>11,.3f}  Qty {qty_str:>8}",
-                     fg=LIGHT_RED, bg=DARK_BG, font=FONT_SMALL).pack(anchor="w")
+        for labels, levels in ((self.bid_labels, data["bids"]), (self.ask_labels, data["asks"])):
+            for i, label in enumerate(labels):
+                if i < len(levels):
+                    p, q = levels[i]
+                    label.config(text=f"${float(p):>11,.3f}  Qty {self.format_qty(float(q)):>8}")
+                else:
+                    label.config(text="--")
 
     def set_visible(self, visible: bool):
         self.data_visible = visible
@@ -0,0 +1,39 @@
+import threading
+from .debug import log
+
+FRAME_MS = 100  # at most 10 redraws per second per panel
+
+
+class RedrawScheduler:
+    """Single Tk redraw loop shared by all panels.
+
+    Panels request redraws from any thread; requests with the same key are coalesced so only the
+    latest one runs on the next frame, however many stream messages arrived in between.
+    """
+
+    def __init__(self, root, frame_ms=FRAME_MS):
+        self.root = root
+        self.frame_ms = frame_ms
+        self.pending = {}  # key -> callable
+        self.lock = threading.Lock()
+        self.running = True
+        self.root.after(self.frame_ms, self.tick)
+
+    def request(self, key, func):
+        with self.lock:
+            self.pending[key] = func
+
+    def tick(self):
+        if not self.running:
+            return
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        for func in pending.values():
+            try:
+                func()
+            except Exception as e:
+                log("SCHEDULER", f"Redraw error {e}")
+        self.root.after(self.frame_ms, self.tick)
+
+    def stop(self):
+        self.running = False
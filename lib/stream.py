@@ -0,0 +1,145 @@
+import itertools
+import json
+import threading
+import time
+import requests
+import websocket
+from .debug import log
+
+STREAM_URL = "wss://stream.binance.com:9443/stream"
+RECONNECT_DELAY = 3  # seconds
+SYNC_INTERVAL = 1  # seconds; at most one SUBSCRIBE and one UNSUBSCRIBE per interval (Binance allows 5 messages/s)
+
+
+class StreamHub:
+    """One combined Binance WebSocket shared by every panel, dispatching payloads by stream name.
+
+    Streams are added and removed on the live socket with SUBSCRIBE/UNSUBSCRIBE, so switching
+    symbols or adding grid tiles never opens a new connection. Handler changes only mark the
+    subscriptions dirty; a sync thread batches them into at most one control message of each
+    kind per SYNC_INTERVAL. REST callers share `session`.
+    """
+
+    def __init__(self):
+        self.running = True
+        self.handlers = {}  # stream -> [callback(data), ...]
+        self.active = set()  # streams subscribed on the current socket
+        self.connected = False
+        self.ws = None
+        self.ids = itertools.count(1)
+        self.lock = threading.RLock()
+        self.wake = threading.Event()
+        self.dirty = threading.Event()
+        self.session = requests.Session()
+
+        threading.Thread(target=self.run, daemon=True).start()
+        threading.Thread(target=self.sync_loop, daemon=True).start()
+
+    # ---------------- Subscriptions ----------------
+    def subscribe(self, stream, callback):
+        with self.lock:
+            self.handlers.setdefault(stream, []).append(callback)
+            self.mark_dirty()
+
+    def unsubscribe(self, stream, callback):
+        with self.lock:
+            callbacks = self.handlers.get(stream, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+            if not callbacks:
+                self.handlers.pop(stream, None)
+            self.mark_dirty()
+
+    def mark_dirty(self):
+        with self.lock:
+            self.dirty.set()
+            if not self.connected:
+                self.wake.set()  # the connect loop opens the socket with every registered stream
+
+    def sync_loop(self):
+        while self.running:
+            self.dirty.wait()
+            # Let a burst of handler changes (symbol switch, new tile) settle into one diff
+            time.sleep(SYNC_INTERVAL)
+            self.dirty.clear()
+            if self.running:
+                self.sync()
+
+    def sync(self):
+        """Bring the socket's subscriptions in line with the registered handlers."""
+        with self.lock:
+            if not self.connected:
+                return
+            wanted = set(self.handlers)
+            added = sorted(wanted - self.active)
+            removed = sorted(self.active - wanted)
+            try:
+                if added:
+                    self.ws.send(json.dumps({"method": "SUBSCRIBE", "params": added, "id": next(self.ids)}))
+                if removed:
+                    self.ws.send(json.dumps({"method": "UNSUBSCRIBE", "params": removed, "id": next(self.ids)}))
+                self.active = wanted
+            except Exception as e:
+                log("STREAM", f"Error updating subscriptions: {e}")
+
+    # ---------------- Connection ----------------
+    def run(self):
+        while self.running:
+            with self.lock:
+                streams = sorted(self.handlers)
+            if not streams:
+                self.wake.wait()
+                self.wake.clear()
+                continue
+
+            log("STREAM", f"Connecting combined stream ({len(streams)} streams)")
+            self.ws = websocket.WebSocketApp(
+                f"{STREAM_URL}?streams={'/'.join(streams)}",
+                on_open=lambda ws, s=streams: self.on_open(s),
+                on_message=self.on_message,
+                on_error=self.on_error,
+                on_close=self.on_close
+            )
+            self.ws.run_forever()
+            if self.running:
+                self.wake.wait(RECONNECT_DELAY)
+                self.wake.clear()
+
+    def on_open(self, streams):
+        with self.lock:
+            self.connected = True
+            self.active = set(streams)
+            self.dirty.set()  # catch handlers changed while the socket was opening
+
+    def on_message(self, ws, message):
+        try:
+            msg = json.loads(message)
+            stream = msg.get("stream")
+            if stream is None:
+                return  # SUBSCRIBE/UNSUBSCRIBE acknowledgement
+            with self.lock:
+                callbacks = list(self.handlers.get(stream, ()))
+            for callback in callbacks:
+                callback(msg["data"])
+        except Exception as e:
+            log("STREAM", f"Parse error {e}")
+
+    def on_error(self, ws, error):
+        log("STREAM", f"WebSocket error {error}")
+
+    def on_close(self, ws, *args):
+        with self.lock:
+            self.connected = False
+            self.active = set()
+        log("STREAM", "WebSocket closed")
+
+    def stop(self):
+        log("STREAM", "Stopping")
+        self.running = False
+        self.wake.set()
+        self.dirty.set()
+        try:
+            if self.ws:
+                self.ws.close()
+        except:
+            pass
@@ -1,7 +1,4 @@
 import tkinter as tk
-import json
-import threading
-import websocket
 from .debug import log
 from .base import BasePanel
 
@@ -13,12 +10,13 @@ FONT = ("Courier New", 13, "bold")
 
 
 class CryptoTicker(BasePanel):
-    def __init__(self, parent, symbol, name):
-        super().__init__()
+    def __init__(self, parent, symbol, name, hub=None, scheduler=None):
+        super().__init__(hub, scheduler)
         self.parent = parent
         self.symbol = symbol.lower()
+        self.stream = f"{self.symbol}@ticker"
 
-        log("TICKER", f"Connecting WebSocket {self.symbol}@ticker")
+        log("TICKER", f"Connecting WebSocket {self.stream}")
 
         self.frame = tk.Frame(parent, bg=DARK_BG, padx=10, pady=10)
 
@@ -30,21 +28,15 @@ class CryptoTicker(BasePanel):
         self.change_label = tk.Label(self.frame, font=("Courier New", 11, "bold"), bg=DARK_BG, fg=WHITE, text="24h Change : --")
         self.change_label.pack(anchor="w")
 
-        self.ws = websocket.WebSocketApp(
-            f"wss://stream.binance.com:9443/ws/{self.symbol}@ticker",
-            on_message=self.on_message
-        )
-        threading.Thread(target=self.ws.run_forever, daemon=True).start()
+        self.connect()
 
-    def on_message(self, ws, message):
-        if not self.running:
-            return
-        data = json.loads(message)
+    def handle(self, data):
         price = float(data["c"])
         change = float(data["P"])
         color = GREEN if change >= 0 else RED
         sign = "+" if change >= 0 else ""
-        self.parent.after(0, lambda: self.safe_update(price, change, sign, color))
+        if self.rendering:
+            self.post(self.safe_update, price, change, sign, color)
 
     def safe_update(self, price, change, sign, color):
         if self.running and getattr(self, "price_label", None) and self.price_label.winfo_exists():
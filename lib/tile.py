@@ -0,0 +1,43 @@
+import tkinter as tk
+from .debug import log
+from .ticker import CryptoTicker
+from .last_trade import LastTradePanel
+from .orderbook import OrderBookPanel
+from .chart import CryptoChart
+
+DARK_BG = "#242a24"
+BORDER = "#1d221d"
+
+
+class SymbolTile:
+    """One symbol in the grid layout: ticker, last trade and book beside a candlestick chart.
+
+    Tiles share the dashboard's StreamHub and RedrawScheduler, so adding a tile adds streams to
+    the existing socket rather than opening new connections.
+    """
+
+    def __init__(self, parent, symbol, name, hub, scheduler):
+        self.symbol = symbol
+        log("TILE", f"Creating tile for {symbol.upper()}")
+
+        self.frame = tk.Frame(parent, bg=DARK_BG, highlightbackground=BORDER, highlightthickness=2)
+
+        left = tk.Frame(self.frame, bg=DARK_BG)
+        left.pack(side=tk.LEFT, fill=tk.Y)
+
+        self.ticker = CryptoTicker(left, symbol, name, hub=hub, scheduler=scheduler)
+        self.trades = LastTradePanel(left, symbol, hub=hub, scheduler=scheduler)
+        self.orderbook = OrderBookPanel(left, symbol, hub=hub, scheduler=scheduler)
+        for p in (self.ticker, self.trades, self.orderbook):
+            p.frame.pack(fill=tk.X)
+
+        chart_container = tk.Frame(self.frame, bg=DARK_BG)
+        chart_container.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+        self.chart = CryptoChart(chart_container, symbol, session=hub.session, scheduler=scheduler, hub=hub)
+
+        self.panels = [self.ticker, self.trades, self.orderbook, self.chart]
+
+    def stop(self):
+        for p in self.panels:
+            p.stop()
+        self.frame.destroy()
@@ -1,11 +1,14 @@
 import tkinter as tk
 import threading
-import requests
-from .debug import log
+from .base import BasePanel
 
 DARK_BG = "#242a24"
 WHITE = "#ffffff"
+GRAY = "#9c9c9c"
 FONT = ("Courier New", 11, "bold")
+FONT_SMALL = ("Courier New", 10, "bold")
+ROLLING_WINDOWS = (60, 300, 3600)  # seconds
+WINDOW_NAMES = {60: "1m", 300: "5m", 3600: "1h"}
 
 
 def get_base_asset(symbol: str) -> str:
@@ -16,38 +19,103 @@ def get_base_asset(symbol: str) -> str:
     return symbol
 
 
-class VolumePanel:
-    """Volume panel does not use WebSocket, simple API fetch."""
+class RollingVolume:
+    """Per-second volume buckets with a running sum per rolling window."""
 
-    def __init__(self, parent, symbol):
+    def __init__(self, windows=ROLLING_WINDOWS):
+        self.windows = windows
+        self.size = max(windows)
+        self.buckets = [0.0] * self.size
+        self.sums = {w: 0.0 for w in windows}
+        self.now = None  # newest second seen
+        self.start = None  # first second of the data behind the sums
+        self.lock = threading.Lock()
+
+    def _reset(self, second):
+        self.buckets = [0.0] * self.size
+        self.sums = {w: 0.0 for w in self.windows}
+        self.now = second
+        self.start = second
+
+    def _advance(self, second):
+        if self.now is None or second - self.now >= self.size:
+            self._reset(second)
+            return
+        for s in range(self.now + 1, second + 1):
+            # Second s - w leaves window w; drop it from the sum before its bucket is reused
+            for w in self.windows:
+                self.sums[w] -= self.buckets[(s - w) % self.size]
+            self.buckets[s % self.size] = 0.0
+        self.now = max(self.now, second)
+
+    def advance(self, ts):
+        """Move the clock to exchange time ts (seconds) without adding volume."""
+        with self.lock:
+            self._advance(int(ts))
+
+    def add(self, ts, qty):
+        second = int(ts)
+        with self.lock:
+            self._advance(second)
+            age = self.now - second
+            if age >= self.size:
+                return
+            self.buckets[second % self.size] += qty
+            for w in self.windows:
+                if age < w:
+                    self.sums[w] += qty
+
+    def totals(self):
+        with self.lock:
+            return {w: max(total, 0.0) for w, total in self.sums.items()}
+
+    def elapsed(self):
+        """Seconds covered by the sums; windows longer than this are still warming up."""
+        with self.lock:
+            return 0 if self.now is None else self.now - self.start
+
+
+class VolumePanel(BasePanel):
+    """Volume panel has no WebSocket of its own; it listens to the ticker and trade streams."""
+
+    def __init__(self, parent, symbol, scheduler=None):
+        super().__init__(scheduler=scheduler)
         self.parent = parent
         self.symbol = symbol.upper()
         self.unit = get_base_asset(self.symbol)
+        self.rolling = RollingVolume()
 
         self.frame = tk.Frame(parent, bg=DARK_BG, padx=10, pady=10)
 
         self.label = tk.Label(self.frame, font=FONT, bg=DARK_BG, fg=WHITE, anchor="w", text="24h Volume : --")
         self.label.pack(fill=tk.X)
 
-        threading.Thread(target=self.fetch, daemon=True).start()
-
-    def fetch(self):
-        try:
-            log("VOLUME", f"Fetching 24h volume {self.symbol}")
-            data = requests.get(
-                "https://api.binance.com/api/v3/ticker/24hr",
-                params={"symbol": self.symbol},
-                timeout=5
-            ).json()
-            volume = float(data["volume"])
-            self.parent.after(0, lambda: self.safe_update(volume))
-            log("VOLUME", f"Loaded 24h volume {volume:,.3f} {self.unit}")
-        except Exception as e:
-            log("VOLUME", f"Error {e}")
-
-    def safe_update(self, volume):
-        if getattr(self, "label", None) and self.label.winfo_exists():
-            self.label.config(text=f"24h Volume : {volume:,.3f} {self.unit}")
-
-    def stop(self):
-        log("VOLUME", "Stopping (no loop running)")
+        self.rolling_label = tk.Label(self.frame, font=FONT_SMALL, bg=DARK_BG, fg=GRAY, anchor="w",
+                                      text="Rolling 1m / 5m / 1h : --")
+        self.rolling_label.pack(fill=tk.X)
+
+    # ---------------- Stream listeners (WebSocket threads) ----------------
+    def on_ticker(self, data):
+        if not self.running:
+            return
+        volume = float(data["v"])
+        quote_volume = float(data["q"])
+        # The ticker arrives every second and keeps the rolling clock moving when no trades print
+        self.rolling.advance(data["E"] / 1000)
+        if not self.rendering:
+            return
+        totals = self.rolling.totals()
+        self.post(self.safe_update, volume, quote_volume, totals, self.rolling.elapsed())
+
+    def on_trade(self, data):
+        if not self.running:
+            return
+        self.rolling.add(data["T"] / 1000, float(data["q"]))
+
+    def safe_update(self, volume, quote_volume, totals, elapsed):
+        if self.running and getattr(self, "label", None) and self.label.winfo_exists():
+            self.label.config(text=f"24h Volume : {volume:,.3f} {self.unit} (${quote_volume / 1_000_000:,.1f}M)")
+            names = " / ".join(WINDOW_NAMES.get(w, f"{w}s") for w in totals)
+            # A window the panel has not been open for yet would understate its total
+            values = " / ".join(f"{v:,.3f}" if elapsed >= w else "--" for w, v in totals.items())
+            self.rolling_label.config(text=f"Rolling {names} : {values} {self.unit}")
@@ -1,5 +1,6 @@
 import tkinter as tk
 import json
+import math
 import os
 
 from lib import (
@@ -8,6 +9,13 @@ from lib import (
     OrderBookPanel,
     LastTradePanel,
     CryptoChart,
+    DepthHeatmapPanel,
+    AlertEngine,
+    AlertPanel,
+    MarketCapture,
+    StreamHub,
+    RedrawScheduler,
+    SymbolTile,
     log
 )
 
@@ -28,16 +36,23 @@ DARK_YELLOW = "#8d6e00"
 FONT = ("Courier New", 11, "bold")
 TITLE_FONT = ("Courier New", 18, "bold")
 SETTINGS_FILE = "setting.json"
+ALERTS_FILE = "alerts.json"
+# Stream each rule kind is evaluated on, for symbols with rules but no panels on screen
+ALERT_STREAMS = {"cross": "trade", "volume": "trade", "change": "ticker", "spread": "depth20@1000ms"}
+ALERT_HANDLERS = {"trade": "on_trade", "ticker": "on_ticker", "depth20@1000ms": "on_depth"}
 
 # Default setting structure
 DEFAULT_SETTINGS = {
     "last_symbol": "btcusdt",
-    "btcusdt": {"view_orderbook": 1, "view_chart": 1},
-    "ethusdt": {"view_orderbook": 1, "view_chart": 1},
-    "solusdt": {"view_orderbook": 1, "view_chart": 1},
-    "bnbusdt": {"view_orderbook": 1, "view_chart": 1},
-    "xrpusdt": {"view_orderbook": 1, "view_chart": 1},
-    "usdcusdt": {"view_orderbook": 1, "view_chart": 1}
+    "capture": 0,
+    "grid_mode": 0,
+    "grid_symbols": ["btcusdt", "ethusdt", "solusdt", "bnbusdt"],
+    "btcusdt": {"view_orderbook": 1, "view_chart": 1, "view_heatmap": 1},
+    "ethusdt": {"view_orderbook": 1, "view_chart": 1, "view_heatmap": 1},
+    "solusdt": {"view_orderbook": 1, "view_chart": 1, "view_heatmap": 1},
+    "bnbusdt": {"view_orderbook": 1, "view_chart": 1, "view_heatmap": 1},
+    "xrpusdt": {"view_orderbook": 1, "view_chart": 1, "view_heatmap": 1},
+    "usdcusdt": {"view_orderbook": 1, "view_chart": 1, "view_heatmap": 1}
 }
 
 
@@ -63,18 +78,44 @@ class CryptoDashboard:
         self.buttons = {}
         self.active_panels = []
         self.chart_panel = None
+        self.heatmap_panel = None
+        self.tiles = {}
+        self.alert_feeds = {}  # stream -> hub callback feeding the alert engine directly
         self.settings = self.load_settings()
         self.current_symbol = self.settings.get("last_symbol", "btcusdt")
         self.initialized = False
+        self.iconified = False
+        self.grid_mode = bool(self.settings.get("grid_mode", 0))
+        self.grid_symbols = [s for s in self.settings.get("grid_symbols", []) if s in self.symbols] or ["btcusdt"]
+
+        # One network connection, one HTTP session and one redraw loop shared by every panel
+        self.hub = StreamHub()
+        self.scheduler = RedrawScheduler(self.root)
+
+        self.alerts = AlertEngine(on_alert=self.on_alert)
+        self.alerts.load(ALERTS_FILE)
+
+        self.capture = None
+        if self.settings.get("capture", 0):
+            try:
+                self.capture = MarketCapture()
+            except RuntimeError as e:
+                log("MAIN", f"Capture disabled: {e}")
 
         self.chart_visible = bool(self.settings.get(self.current_symbol, {}).get("view_chart", 1))
         self.orderbook_visible = bool(self.settings.get(self.current_symbol, {}).get("view_orderbook", 1))
+        self.heatmap_visible = bool(self.settings.get(self.current_symbol, {}).get("view_heatmap", 1))
 
         self.setup_ui()
-        self.switch_symbol(self.current_symbol)
+        if self.grid_mode:
+            self.show_grid()
+        else:
+            self.switch_symbol(self.current_symbol)
         self.initialized = True
 
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.bind("<Unmap>", self.on_unmap)
+        self.root.bind("<Map>", self.on_map)
 
     # ================= UI =================
     def setup_ui(self):
@@ -119,14 +160,40 @@ class CryptoDashboard:
             lambda e: self.chart_toggle_btn.config(bg=YELLOW if self.chart_visible else DARK_YELLOW)
         )
 
-        main = tk.Frame(self.root, bg=DARK_BG)
-        main.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.heatmap_toggle_btn = tk.Button(btn_frame, text="Heatmap", font=FONT, fg="black", width=10, height=1,
+                                            relief="flat", command=self.toggle_heatmap)
+        self.heatmap_toggle_btn.pack(side=tk.LEFT, padx=5)
+        self.heatmap_toggle_btn.bind("<Enter>", lambda e: self.heatmap_toggle_btn.config(bg=LIGHT_YELLOW))
+        self.heatmap_toggle_btn.bind(
+            "<Leave>",
+            lambda e: self.heatmap_toggle_btn.config(bg=YELLOW if self.heatmap_visible else DARK_YELLOW)
+        )
+
+        self.grid_toggle_btn = tk.Button(btn_frame, text="Grid", font=FONT, fg="black", width=10, height=1,
+                                         relief="flat", command=self.toggle_grid)
+        self.grid_toggle_btn.pack(side=tk.LEFT, padx=5)
+        self.grid_toggle_btn.bind("<Enter>", lambda e: self.grid_toggle_btn.config(bg=LIGHT_YELLOW))
+        self.grid_toggle_btn.bind(
+            "<Leave>",
+            lambda e: self.grid_toggle_btn.config(bg=YELLOW if self.grid_mode else DARK_YELLOW)
+        )
+        self.grid_toggle_btn.config(bg=YELLOW if self.grid_mode else DARK_YELLOW)
+
+        # Alerts live in a strip below both layouts; packed first so it keeps its place when they swap
+        self.alert_panel = AlertPanel(self.root, self.alerts, list(self.symbols), on_rules_changed=self.on_rules_changed)
+        self.alert_panel.frame.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=(0, 10))
+        self.alert_panel.set_symbol(self.current_symbol)
+
+        self.main = tk.Frame(self.root, bg=DARK_BG)
+        self.main.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        self.grid_frame = tk.Frame(self.root, bg=DARK_BG)
 
-        self.left = tk.Frame(main, bg=DARK_BG, width=600)
+        self.left = tk.Frame(self.main, bg=DARK_BG, width=600)
         self.left.pack(side=tk.LEFT, fill=tk.Y)
         self.left.pack_propagate(False)
 
-        self.right = tk.Frame(main, bg=LIGHT_BG)
+        self.right = tk.Frame(self.main, bg=LIGHT_BG)
         self.right.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=10, pady=5)
 
         self.right_header = tk.Frame(self.right, bg=LIGHT_BG)
@@ -137,13 +204,19 @@ class CryptoDashboard:
         self.right_chart_container = tk.Frame(self.right, bg=LIGHT_BG)
         self.right_chart_container.pack(fill=tk.BOTH, expand=True)
 
+        self.right_heatmap_container = tk.Frame(self.right, bg=LIGHT_BG)
+        self.right_heatmap_container.pack(fill=tk.BOTH, expand=True)
+
     # ================= HOVER =================
+    def is_selected(self, symbol):
+        return symbol in self.tiles if self.grid_mode else symbol == self.current_symbol
+
     def on_hover_enter(self, symbol, button):
-        if symbol != self.current_symbol:
+        if not self.is_selected(symbol):
             button.config(fg=WHITE, bg=LIGHT_GREEN)
 
     def on_hover_leave(self, symbol, button):
-        if symbol == self.current_symbol:
+        if self.is_selected(symbol):
             button.config(bg=GREEN, fg=WHITE)
         else:
             button.config(bg=DARK_GREEN, fg=GRAY)
@@ -160,8 +233,29 @@ class CryptoDashboard:
             self.chart_panel.frame.destroy()
             self.chart_panel = None
 
-    def switch_symbol(self, symbol):
-        if self.initialized and symbol == self.current_symbol:
+        if self.heatmap_panel:
+            self.heatmap_panel.stop()
+            self.heatmap_panel.frame.destroy()
+            self.heatmap_panel = None
+
+    def wire_panels(self, symbol, ticker, trades, orderbook, chart):
+        """Feed alerts and capture from one symbol's panels."""
+        ticker.add_listener(lambda d, s=symbol: self.alerts.on_ticker(s, d))
+        trades.add_listener(lambda d, s=symbol: self.alerts.on_trade(s, d))
+        orderbook.add_listener(lambda d, s=symbol: self.alerts.on_depth(s, d))
+
+        if self.capture:
+            ticker.add_listener(lambda d, s=symbol: self.capture.on_ticker(s, d))
+            trades.add_listener(lambda d, s=symbol: self.capture.on_trade(s, d))
+            orderbook.add_listener(lambda d, s=symbol: self.capture.on_depth(s, d))
+            chart.add_listener(lambda k, s=symbol, i=chart.interval: self.capture.on_klines(s, i, k))
+
+    def switch_symbol(self, symbol, force=False):
+        if self.grid_mode:
+            self.toggle_grid_symbol(symbol)
+            return
+
+        if self.initialized and symbol == self.current_symbol and not force:
             log("MAIN", f"Symbol {symbol.upper()} already active, skipping reload")
             return
 
@@ -175,33 +269,116 @@ class CryptoDashboard:
         self.clear_panels()
 
         panels = [
-            CryptoTicker(self.left, symbol, self.symbols[symbol]),
-            VolumePanel(self.left, symbol),
-            LastTradePanel(self.left, symbol),
-            OrderBookPanel(self.left, symbol)
+            CryptoTicker(self.left, symbol, self.symbols[symbol], hub=self.hub, scheduler=self.scheduler),
+            VolumePanel(self.left, symbol, scheduler=self.scheduler),
+            LastTradePanel(self.left, symbol, hub=self.hub, scheduler=self.scheduler),
+            OrderBookPanel(self.left, symbol, hub=self.hub, scheduler=self.scheduler)
         ]
 
         for p in panels:
             p.frame.pack(fill=tk.X, pady=5)
             self.active_panels.append(p)
 
-        self.chart_panel = CryptoChart(self.right_chart_container, symbol)
+        ticker, volume, trades, orderbook = panels
+        ticker.add_listener(volume.on_ticker)
+        trades.add_listener(volume.on_trade)
+
+        self.chart_panel = CryptoChart(self.right_chart_container, symbol,
+                                       session=self.hub.session, scheduler=self.scheduler, hub=self.hub)
+        self.wire_panels(symbol, ticker, trades, orderbook, self.chart_panel)
+        self.alert_panel.set_symbol(symbol)
+
+        self.heatmap_panel = DepthHeatmapPanel(self.right_heatmap_container, symbol, scheduler=self.scheduler)
+        self.heatmap_panel.frame.pack(fill=tk.BOTH, expand=True)
+        orderbook.add_listener(self.heatmap_panel.on_depth)
 
         # Restore toggle states
         self.chart_visible = bool(self.settings.get(symbol, {}).get("view_chart", 1))
         self.orderbook_visible = bool(self.settings.get(symbol, {}).get("view_orderbook", 1))
+        self.heatmap_visible = bool(self.settings.get(symbol, {}).get("view_heatmap", 1))
         if not self.chart_visible:
             self.chart_panel.frame.pack_forget()
         if not self.orderbook_visible:
             for p in self.active_panels:
                 if p.__class__.__name__ == "OrderBookPanel":
                     p.set_visible(False)
+        if not self.heatmap_visible:
+            self.heatmap_panel.frame.pack_forget()
 
         self.chart_toggle_btn.config(bg=YELLOW if self.chart_visible else DARK_YELLOW)
+        self.heatmap_toggle_btn.config(bg=YELLOW if self.heatmap_visible else DARK_YELLOW)
         self.orderbook_toggle_btn.config(bg=YELLOW if self.orderbook_visible else DARK_YELLOW)
 
+        self.update_feeds()
+        self.refresh_symbol_buttons()
+
+    # ================= GRID =================
+    def show_grid(self):
+        log("MAIN", f"Grid layout: {', '.join(s.upper() for s in self.grid_symbols)}")
+        self.clear_panels()
+        self.main.pack_forget()
+        self.grid_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.title.config(text="Multi-Symbol Dashboard")
+        for btn in (self.orderbook_toggle_btn, self.chart_toggle_btn, self.heatmap_toggle_btn):
+            btn.config(state=tk.DISABLED)
+
+        for symbol in self.grid_symbols:
+            self.add_tile(symbol)
+        self.layout_tiles()
+        self.update_feeds()
+        self.refresh_symbol_buttons()
+
+    def hide_grid(self):
+        for tile in self.tiles.values():
+            tile.stop()
+        self.tiles.clear()
+        self.grid_frame.pack_forget()
+        self.main.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        for btn in (self.orderbook_toggle_btn, self.chart_toggle_btn, self.heatmap_toggle_btn):
+            btn.config(state=tk.NORMAL)
+        self.switch_symbol(self.current_symbol, force=True)
+
+    def add_tile(self, symbol):
+        tile = SymbolTile(self.grid_frame, symbol, self.symbols[symbol], self.hub, self.scheduler)
+        self.wire_panels(symbol, tile.ticker, tile.trades, tile.orderbook, tile.chart)
+        self.tiles[symbol] = tile
+
+    def layout_tiles(self):
+        cols = math.ceil(math.sqrt(len(self.tiles)))
+        rows = math.ceil(len(self.tiles) / cols)
+        for i in range(len(self.symbols)):
+            self.grid_frame.grid_columnconfigure(i, weight=1 if i < cols else 0, uniform="tile")
+            self.grid_frame.grid_rowconfigure(i, weight=1 if i < rows else 0, uniform="tile")
+        for i, tile in enumerate(self.tiles.values()):
+            tile.frame.grid(row=i // cols, column=i % cols, sticky="nsew", padx=4, pady=4)
+
+    def toggle_grid(self):
+        self.grid_mode = not self.grid_mode
+        self.grid_toggle_btn.config(bg=YELLOW if self.grid_mode else DARK_YELLOW)
+        if self.grid_mode:
+            self.show_grid()
+        else:
+            self.hide_grid()
+        self.save_current_settings()
+
+    def toggle_grid_symbol(self, symbol):
+        if symbol in self.tiles:
+            if len(self.tiles) == 1:
+                return
+            self.tiles.pop(symbol).stop()
+            self.grid_symbols = [s for s in self.grid_symbols if s != symbol]
+        else:
+            self.add_tile(symbol)
+            self.grid_symbols = self.grid_symbols + [symbol]
+        log("MAIN", f"Grid layout: {', '.join(s.upper() for s in self.grid_symbols)}")
+        self.layout_tiles()
+        self.update_feeds()
+        self.refresh_symbol_buttons()
+        self.save_current_settings()
+
+    def refresh_symbol_buttons(self):
         for s, btn in self.buttons.items():
-            if s == symbol:
+            if self.is_selected(s):
                 btn.config(bg=GREEN, fg=WHITE)
             else:
                 btn.config(bg=DARK_GREEN, fg=GRAY)
@@ -217,6 +394,20 @@ class CryptoDashboard:
                 log("TOGGLE", f"Chart shown for {self.current_symbol.upper()}")
             self.chart_visible = not self.chart_visible
             self.chart_toggle_btn.config(bg=YELLOW if self.chart_visible else DARK_YELLOW)
+            self.update_feeds()
+            self.save_current_settings()
+
+    def toggle_heatmap(self):
+        if self.heatmap_panel:
+            if self.heatmap_visible:
+                self.heatmap_panel.frame.pack_forget()
+                log("TOGGLE", f"Heatmap hidden for {self.current_symbol.upper()}")
+            else:
+                self.heatmap_panel.frame.pack(fill=tk.BOTH, expand=True)
+                log("TOGGLE", f"Heatmap shown for {self.current_symbol.upper()}")
+            self.heatmap_visible = not self.heatmap_visible
+            self.heatmap_toggle_btn.config(bg=YELLOW if self.heatmap_visible else DARK_YELLOW)
+            self.update_feeds()
             self.save_current_settings()
 
     def toggle_orderbook(self):
@@ -226,8 +417,94 @@ class CryptoDashboard:
                 log("TOGGLE", f"OrderBook {'shown' if not self.orderbook_visible else 'hidden'} for {self.current_symbol.upper()}")
         self.orderbook_visible = not self.orderbook_visible
         self.orderbook_toggle_btn.config(bg=YELLOW if self.orderbook_visible else DARK_YELLOW)
+        self.update_feeds()
         self.save_current_settings()
 
+    # ================= LIFECYCLE =================
+    def update_feeds(self):
+        """Pause feeds and rendering nothing is looking at; resume (and resync) the rest."""
+        shown = not self.iconified
+        capturing = self.capture is not None
+
+        for symbol, tile in self.tiles.items():
+            for p in tile.panels:
+                p.rendering = shown
+            if shown or capturing:
+                tile.chart.resume()
+            else:
+                tile.chart.pause()
+            if shown or capturing or self.has_spread_alerts(symbol):
+                tile.orderbook.resume()
+            else:
+                tile.orderbook.pause()
+
+        if self.chart_panel:
+            self.chart_panel.rendering = self.chart_visible and shown
+            if self.chart_panel.rendering or capturing:
+                self.chart_panel.resume()
+            else:
+                self.chart_panel.pause()
+
+        if self.heatmap_panel:
+            self.heatmap_panel.set_visible(self.heatmap_visible and shown)
+
+        spread_alerts = self.has_spread_alerts(self.current_symbol)
+        for p in self.active_panels:
+            # Feeds stay live for alerts and capture; only the label updates stop
+            p.rendering = shown
+            if p.__class__.__name__ == "OrderBookPanel":
+                if ((self.orderbook_visible or self.heatmap_visible) and shown) or capturing or spread_alerts:
+                    p.resume()
+                else:
+                    p.pause()
+
+        self.sync_alert_feeds()
+
+    def has_spread_alerts(self, symbol):
+        return any(r.kind == "spread" for r in self.alerts.rules_for(symbol))
+
+    def on_unmap(self, event):
+        # <Unmap>/<Map> bound on the root also fire for every child widget
+        if event.widget is self.root and not self.iconified:
+            log("MAIN", "Window minimized, suspending hidden panels")
+            self.iconified = True
+            self.update_feeds()
+
+    def on_map(self, event):
+        if event.widget is self.root and self.iconified:
+            log("MAIN", "Window restored, resuming panels")
+            self.iconified = False
+            self.update_feeds()
+
+    # ================= ALERTS =================
+    def on_rules_changed(self):
+        self.alerts.save(ALERTS_FILE)
+        self.update_feeds()
+
+    def sync_alert_feeds(self):
+        """Subscribe the engine itself to streams of symbols that have rules but no panels shown."""
+        shown = set(self.tiles) if self.grid_mode else {self.current_symbol}
+        wanted = {}
+        for symbol in self.symbols:
+            if symbol in shown:
+                continue
+            for rule in self.alerts.rules_for(symbol):
+                suffix = ALERT_STREAMS[rule.kind]
+                wanted[f"{symbol}@{suffix}"] = (symbol, suffix)
+
+        for stream in list(self.alert_feeds):
+            if stream not in wanted:
+                self.hub.unsubscribe(stream, self.alert_feeds.pop(stream))
+        for stream, (symbol, suffix) in wanted.items():
+            if stream not in self.alert_feeds:
+                handler = getattr(self.alerts, ALERT_HANDLERS[suffix])
+                self.alert_feeds[stream] = lambda d, s=symbol, h=handler: h(s, d)
+                self.hub.subscribe(stream, self.alert_feeds[stream])
+
+    def on_alert(self, messages):
+        # Called from WebSocket threads
+        self.root.after(0, lambda: self.alert_panel.show_alerts(messages))
+
     # ================= SETTINGS =================
     def load_settings(self):
         if os.path.exists(SETTINGS_FILE):
@@ -237,7 +514,7 @@ class CryptoDashboard:
                     # Ensure all keys exist
                     for sym, default in DEFAULT_SETTINGS.items():
                         if sym not in data:
-                            data[sym] = default if isinstance(default, dict) else {}
+                            data[sym] = default.copy() if isinstance(default, dict) else default
                     return data
             except Exception as e:
                 log("MAIN", f"Error loading settings: {e}")
@@ -246,9 +523,12 @@ class CryptoDashboard:
 
     def save_current_settings(self):
         self.settings["last_symbol"] = self.current_symbol
+        self.settings["grid_mode"] = int(self.grid_mode)
+        self.settings["grid_symbols"] = self.grid_symbols
         self.settings[self.current_symbol] = {
             "view_chart": int(self.chart_visible),
-            "view_orderbook": int(self.orderbook_visible)
+            "view_orderbook": int(self.orderbook_visible),
+            "view_heatmap": int(self.heatmap_visible)
         }
         try:
             with open(SETTINGS_FILE, "w") as f:
@@ -258,6 +538,11 @@ class CryptoDashboard:
 
     def on_close(self):
         self.save_current_settings()
+        self.alerts.save(ALERTS_FILE)
+        if self.capture:
+            self.capture.stop()
+        self.scheduler.stop()
+        self.hub.stop()
         log("MAIN", "Closing application")
         self.root.destroy()
 